@@ -1,62 +1,186 @@
+import atexit
 import json
 import os
-from datetime import datetime
-import re
+import pickle
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from functools import lru_cache
+import queue
+import sys
+import threading
+import uuid
 
-# Passenger class to store individual passenger details
+try:
+    import orjson  # Rust-based JSON library, much faster than the stdlib
+except ImportError:
+    orjson = None  # Fall back to the stdlib json module if orjson is missing
+
+_PASSPORT_CHARS = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"  # Bytes allowed in a passport number
+
+def dumps_record(record):
+    # Serialize one reservation record to a single JSON line (bytes)
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    # Compact separators skip the pretty-printing path and match orjson's output
+    return (json.dumps(record, separators=(',', ':'), ensure_ascii=False) + "\n").encode("utf-8")
+
+def loads_record(raw):
+    # Deserialize one JSON line into a reservation record
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Passenger dataclass to store individual passenger details; slots=True stores the
+# fields in a fixed-size array instead of a per-instance __dict__, and eq=False
+# keeps identity comparison so the indexes behave as before
+@dataclass(slots=True, eq=False)
 class Passenger:
-    def __init__(self, name, passport, flight_no, seat):
-        # Initialize passenger attributes
-        self.name = name  # Passenger's full name
-        self.passport = passport  # Passenger's passport number
-        self.flight_no = flight_no  # Flight number for the booking
-        self.seat = seat  # Assigned seat (e.g., 1A)
-        self.booking_id = self.generate_booking_id()  # Unique booking ID
+    name: str  # Passenger's full name
+    passport: str  # Passenger's passport number
+    flight_no: str  # Flight number for the booking
+    seat: str  # Assigned seat (e.g., 1A)
+    booking_id: str = None  # Persisted booking ID, or None to generate a new one
+    _cached_dict: dict = field(default=None, repr=False)  # Memoized to_dict() result
+
+    def __post_init__(self):
+        # Flights and seats draw from tiny fixed pools, so intern them: every
+        # passenger on FL101 shares one string object instead of holding a copy
+        self.flight_no = sys.intern(self.flight_no)
+        self.seat = sys.intern(self.seat)
+        if not self.booking_id:
+            self.booking_id = self.generate_booking_id()  # Fresh booking, assign an ID
 
     def generate_booking_id(self):
-        # Generate a unique booking ID based on the current timestamp
-        return f"BK{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        # Generate a unique booking ID; timestamps collide within the same second
+        return f"BK{uuid.uuid4().hex[:12].upper()}"
 
     def to_dict(self):
-        # Convert passenger details to a dictionary for JSON serialization
-        return {
-            "booking_id": self.booking_id,
-            "name": self.name,
-            "passport": self.passport,
-            "flight_no": self.flight_no,
-            "seat": self.seat
-        }
+        # Convert passenger details to a dictionary for JSON serialization (built once, then reused)
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "booking_id": self.booking_id,
+                "name": self.name,
+                "passport": self.passport,
+                "flight_no": self.flight_no,
+                "seat": self.seat
+            }
+        return self._cached_dict
 
 # AirlineSystem class to manage reservations and flight details
 class AirlineSystem:
-    def __init__(self, data_file="reservations.json"):
-        # Initialize the system with a JSON file for storing reservations
-        self.data_file = data_file  # File to store reservation data
+    # Valid flights and seats are fixed, so build them once at class level
+    _FLIGHT_LIST = ["FL101", "FL102", "FL103"]  # Valid flight numbers, in display order
+    _SEAT_LIST = [f"{row}{letter}" for row in range(1, 11) for letter in "ABCDEF"]  # Seat numbers 1A to 10F
+    _FLIGHTS = frozenset(_FLIGHT_LIST)  # O(1) flight membership checks
+    _SEATS = frozenset(_SEAT_LIST)  # O(1) seat membership checks
+
+    def __init__(self, data_file="reservations.jsonl"):
+        # Initialize the system with a JSONL file for storing reservations
+        self.data_file = data_file  # File to store reservation data (one JSON record per line)
+        self.index_file = data_file + '.idx'  # Pickled sidecar with reservations plus derived indexes
         self.reservations = []  # List to store all passenger reservations
-        self.available_flights = ["FL101", "FL102", "FL103"]  # List of valid flight numbers
-        self.seats = [f"{row}{letter}" for row in range(1, 11) for letter in "ABCDEF"]  # Generate seat numbers (1A to 10F)
+        self.available_flights = self._FLIGHT_LIST  # List of valid flight numbers (for display)
+        self.seats = self._SEAT_LIST  # List of seat numbers (for display)
+        self._dirty = False  # True when the file needs a full rewrite (i.e. after a cancellation)
+        self._version = 0  # Bumped on every mutation; stale cached searches fall out of the LRU
+        self._search_cached = lru_cache(maxsize=128)(self._search_range)  # Per-instance memoized search
+        self._write_queue = queue.Queue()  # Serialized records awaiting the background writer
+        self._write_error = None  # Failure from the background writer, re-raised by _flush
+        self._io_lock = threading.Lock()  # Keeps appends and compaction rewrites from interleaving
         self.load_reservations()  # Load existing reservations from file
+        # Background writer appends queued records so bookings never block on disk
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+        atexit.register(self._flush)  # Ensure queued bookings reach disk on exit
 
     def load_reservations(self):
-        # Load reservations from the JSON file if it exists
+        # Load reservations, preferring the pickled sidecar over a full JSONL parse
+        if self._load_index():
+            return  # Sidecar was fresh and restored everything
         if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
+            with open(self.data_file, 'rb') as f:
                 try:
-                    data = json.load(f)  # Read JSON data
-                    # Convert JSON data to Passenger objects
-                    self.reservations = [Passenger(d["name"], d["passport"], d["flight_no"], d["seat"]) 
-                                       for d in data]
-                except json.JSONDecodeError:
+                    # Stream the file line by line so only one record dict is live at a time,
+                    # instead of materializing the whole file and a parallel list of records
+                    records = (loads_record(line) for line in f if line.strip())
+                    self.reservations = [Passenger(d["name"], d["passport"], d["flight_no"], d["seat"],
+                                                   d.get("booking_id"))
+                                       for d in records]
+                except ValueError:
                     self.reservations = []  # Initialize empty list if JSON is invalid
+        # Build lookup indexes so bookings and cancellations avoid linear scans
+        self._occupied = {(r.flight_no, r.seat) for r in self.reservations}  # Taken (flight, seat) pairs
+        self._id_to_index = {r.booking_id: i for i, r in enumerate(self.reservations)}  # Booking ID -> list index
+        # Keep (casefolded name, Passenger) pairs sorted so searches can use bisect
+        self._sorted_names = sorted(((r.name.casefold(), r) for r in self.reservations),
+                                    key=lambda pair: pair[0])
 
     def save_reservations(self):
-        # Save all reservations to the JSON file
-        with open(self.data_file, 'w') as f:
-            json.dump([r.to_dict() for r in self.reservations], f, indent=4)  # Write reservations as JSON
+        # Rewrite the full JSONL file; used as a compaction step after cancellations
+        if not self._dirty:
+            return  # Nothing to rewrite, skip the disk IO entirely
+        payload = b"".join(dumps_record(r.to_dict()) for r in self.reservations)  # One buffer for the whole file
+        tmp_file = self.data_file + '.tmp'  # Write to a temp file first so a crash cannot tear the data
+        with self._io_lock:  # Don't swap the file out from under an in-flight append
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)  # Single write call instead of one per reservation
+            os.replace(tmp_file, self.data_file)  # Atomically swap the new file into place
+            self._save_index()  # Refresh the sidecar while no append can slip in between
+        self._dirty = False  # File now matches the in-memory state
+
+    def _save_index(self):
+        # Persist the reservations and derived indexes so the next startup can skip the parse
+        with open(self.index_file, 'wb') as f:
+            pickle.dump((self.reservations, self._occupied, self._id_to_index, self._sorted_names),
+                        f, pickle.HIGHEST_PROTOCOL)
+
+    def _load_index(self):
+        # Restore state from the sidecar if it is at least as new as the JSONL file
+        try:
+            if os.stat(self.index_file).st_mtime < os.stat(self.data_file).st_mtime:
+                return False  # Sidecar predates the latest appends, fall back to parsing
+            with open(self.index_file, 'rb') as f:
+                (self.reservations, self._occupied,
+                 self._id_to_index, self._sorted_names) = pickle.load(f)
+            return True
+        except (OSError, EOFError, pickle.PickleError, ValueError):
+            return False  # Missing or unreadable sidecar, fall back to parsing
+
+    def _writer_loop(self):
+        # Background thread: batch queued records and append them in one write each
+        while True:
+            batch = [self._write_queue.get()]  # Block until at least one record arrives
+            try:
+                while True:
+                    batch.append(self._write_queue.get(timeout=0.01))  # Gather more records for up to 10ms
+            except queue.Empty:
+                pass  # Batch window closed, write what we have
+            try:
+                with self._io_lock:
+                    with open(self.data_file, 'ab') as f:
+                        f.write(b"".join(batch))  # One append for the whole batch
+            except OSError as e:
+                self._write_error = e  # Stash the failure so _flush can surface it
+            finally:
+                # Always mark the records done, even on failure, or _flush's
+                # join() would block forever once the writer thread died
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    def _flush(self):
+        # Block until every queued booking has been appended to disk
+        self._write_queue.join()
+        if self._write_error is not None:
+            error, self._write_error = self._write_error, None
+            raise error  # Surface the background write failure to the caller
 
     def validate_passport(self, passport):
         # Validate passport number format (9 alphanumeric characters)
-        return bool(re.match(r'^[A-Z0-9]{9}$', passport))
+        try:
+            encoded = passport.encode('ascii')
+        except UnicodeEncodeError:
+            return False  # Non-ASCII characters are never valid
+        # translate() deletes every allowed byte in C; anything left over is invalid
+        return len(encoded) == 9 and not encoded.translate(None, _PASSPORT_CHARS)
 
     def book_ticket(self, name, passport, flight_no, seat):
         # Book a ticket for a passenger
@@ -64,57 +188,59 @@ class AirlineSystem:
             raise ValueError("Name cannot be empty")  # Ensure name is not empty
         if not self.validate_passport(passport):
             raise ValueError("Invalid passport number (9 alphanumeric characters required)")  # Validate passport
-        if flight_no not in self.available_flights:
+        if flight_no not in self._FLIGHTS:
             raise ValueError("Invalid flight number")  # Check if flight number is valid
-        if seat not in self.seats:
+        if seat not in self._SEATS:
             raise ValueError("Invalid seat")  # Check if seat is valid
-        if any(r.seat == seat and r.flight_no == flight_no for r in self.reservations):
+        if (flight_no, seat) in self._occupied:
             raise ValueError("Seat already booked")  # Check for seat availability
-        
+
         passenger = Passenger(name, passport, flight_no, seat)  # Create new passenger object
         self.reservations.append(passenger)  # Add passenger to reservations
-        self.save_reservations()  # Save updated reservations
+        self._occupied.add((flight_no, seat))  # Mark the seat as taken
+        self._id_to_index[passenger.booking_id] = len(self.reservations) - 1  # Index for O(1) cancellation
+        insort(self._sorted_names, (name.casefold(), passenger), key=lambda pair: pair[0])  # Keep name index sorted
+        self._write_queue.put(dumps_record(passenger.to_dict()))  # Hand the record to the background writer
+        self._version += 1  # Invalidate cached search results
         return passenger.booking_id  # Return the booking ID
 
     def cancel_reservation(self, booking_id):
         # Cancel a reservation by booking ID
-        initial_length = len(self.reservations)  # Store initial number of reservations
-        self.reservations = [r for r in self.reservations if r.booking_id != booking_id]  # Remove matching reservation
-        if len(self.reservations) < initial_length:
-            self.save_reservations()  # Save changes if a reservation was removed
-            return True  # Indicate successful cancellation
-        return False  # Indicate no matching reservation found
+        self._flush()  # Make sure buffered bookings are on disk before rewriting
+        idx = self._id_to_index.pop(booking_id, None)  # O(1) lookup instead of a scan
+        if idx is None:
+            return False  # Indicate no matching reservation found
+        passenger = self.reservations[idx]  # Reservation being cancelled
+        last = self.reservations.pop()  # Swap-and-pop avoids shifting the tail of the list
+        if idx < len(self.reservations):
+            self.reservations[idx] = last  # Move the last reservation into the freed slot
+            self._id_to_index[last.booking_id] = idx  # Keep its index entry in sync
+        self._occupied.discard((passenger.flight_no, passenger.seat))  # Free the seat
+        self._sorted_names.remove((passenger.name.casefold(), passenger))  # Drop from the name index
+        self._dirty = True  # In-memory state now diverges from the file
+        self._version += 1  # Invalidate cached search results
+        self.save_reservations()  # Save changes after the removal
+        return True  # Indicate successful cancellation
 
     def view_reservations(self):
         # Return a list of all reservations as dictionaries
+        self._flush()  # Persist any buffered bookings first
         return [r.to_dict() for r in self.reservations]
 
-    def search_reservations(self, query, reservations=None):
-        # Perform a binary search for reservations by name
-        if reservations is None:
-            reservations = self.reservations  # Use all reservations if none specified
-        
+    def search_reservations(self, query):
+        # Find reservations whose name starts with the query (case-insensitive)
+        self._flush()  # Persist any buffered bookings first
         if not query:
-            return reservations  # Return all reservations if query is empty
-        
-        if len(reservations) == 0:
-            return []  # Return empty list if no reservations
-        
-        # Sort reservations by name (case-insensitive) for binary search
-        reservations.sort(key=lambda x: x.name.lower())
-        mid = len(reservations) // 2  # Find middle index
-        mid_name = reservations[mid].name.lower()  # Get middle name (case-insensitive)
-        query = query.lower()  # Convert query to lowercase
-
-        if mid_name == query:
-            return [reservations[mid]]  # Exact match found
-        elif len(reservations) == 1:
-            return [reservations[0]] if query in mid_name else []  # Partial match for single reservation
-        
-        if query < mid_name:
-            return self.search_reservations(query, reservations[:mid])  # Search left half
-        else:
-            return self.search_reservations(query, reservations[mid:])  # Search right half
+            return self.reservations  # Return all reservations if query is empty
+        # The version argument keys the LRU cache, so repeated searches between
+        # mutations are answered from the cache without touching the index
+        return self._search_cached(query.casefold(), self._version)
+
+    def _search_range(self, q, version):
+        # Bisect the pre-sorted name index to find the range of prefix matches
+        lo = bisect_left(self._sorted_names, q, key=lambda pair: pair[0])
+        hi = bisect_left(self._sorted_names, q + "\uffff", key=lambda pair: pair[0])
+        return [passenger for _, passenger in self._sorted_names[lo:hi]]
 
 def display_menu():
     # Display the main menu options
@@ -128,17 +254,20 @@ def display_menu():
 def main():
     # Main function to run the airline reservation system
     system = AirlineSystem()  # Initialize the airline system
+    # Flights and seats never change, so build the prompt strings once, not per loop iteration
+    flights_str = ", ".join(system.available_flights)  # Available flights display string
+    seats_str = ", ".join(system.seats[:10]) + " ..."  # Sample seats display string
     while True:
         display_menu()  # Show the menu
         try:
             choice = input("Enter your choice (1-5): ").strip()  # Get user input
             if choice == "1":
                 # Book a new ticket
-                print("\nAvailable flights:", ", ".join(system.available_flights))  # Show available flights
+                print("\nAvailable flights:", flights_str)  # Show available flights
                 name = input("Enter name: ").strip()  # Get passenger name
                 passport = input("Enter passport number (9 alphanumeric characters): ").strip()  # Get passport number
                 flight_no = input("Enter flight number: ").strip()  # Get flight number
-                print("Available seats:", ", ".join(system.seats[:10]), "...")  # Show sample seats
+                print("Available seats:", seats_str)  # Show sample seats
                 seat = input("Enter seat (e.g., 1A): ").strip()  # Get seat choice
                 try:
                     booking_id = system.book_ticket(name, passport, flight_no, seat)  # Attempt to book ticket
@@ -161,10 +290,11 @@ def main():
                     print("No reservations found")  # Handle empty reservations
                 else:
                     print("\nAll Reservations:")
-                    for res in reservations:
-                        # Display each reservation's details
-                        print(f"ID: {res['booking_id']}, Name: {res['name']}, Passport: {res['passport']}, "
-                              f"Flight: {res['flight_no']}, Seat: {res['seat']}")
+                    # Build one string and write it in a single call instead of one print per reservation
+                    sys.stdout.write("\n".join(
+                        f"ID: {res['booking_id']}, Name: {res['name']}, Passport: {res['passport']}, "
+                        f"Flight: {res['flight_no']}, Seat: {res['seat']}"
+                        for res in reservations) + "\n")
 
             elif choice == "4":
                 # Search for reservations by name
@@ -174,10 +304,11 @@ def main():
                     print("No matching reservations found")  # Handle no results
                 else:
                     print("\nSearch Results:")
-                    for res in results:
-                        # Display each matching reservation
-                        print(f"ID: {res.booking_id}, Name: {res.name}, Passport: {res.passport}, "
-                              f"Flight: {res.flight_no}, Seat: {res.seat}")
+                    # Single buffered write for all matches, same as the full listing above
+                    sys.stdout.write("\n".join(
+                        f"ID: {res.booking_id}, Name: {res.name}, Passport: {res.passport}, "
+                        f"Flight: {res.flight_no}, Seat: {res.seat}"
+                        for res in results) + "\n")
 
             elif choice == "5":
                 # Exit the program